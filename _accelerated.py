@@ -0,0 +1,672 @@
+"""
+Numba-compiled kernels used by the agents' move scoring.
+
+The flood-fill agent's kernels take the board as a C-contiguous (H, W) uint8
+free-cell mask, 1 where the cell is empty and 0 where it is occupied, computed
+once per tick with (board == 0).view(np.uint8). Positions are encoded as flat
+indices y*W + x. The AgentC kernels at the bottom, which AgentS and AgentW
+share, take an (H, W) uint8 occupancy grid (nonzero = blocked) and plain
+(x, y) coordinates instead. When Numba is not installed the same functions
+run as plain Python.
+"""
+
+from array import array
+
+import numpy as np
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:  # pragma: no cover - pure Python fallback
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda fn: fn
+
+
+# Direction indices match agent_floodfill.DIR_ORDER: UP, RIGHT, DOWN, LEFT.
+# The reverse of direction d is (d + 2) % 4.
+
+# Scoring weights for score_all_moves
+AREA_LIMIT = 300
+W_AREA = 2.0
+W_VORONOI = 1.2
+HEADON_PENALTY = -400.0
+STRAIGHT_BONUS = 10.0
+CRASH_SCORE = -1e6
+
+
+_NEIGHBOR_TABLES = {}
+
+
+def neighbor_table(H, W):
+    """(4, H*W) int32 table whose [d, i] entry is the torus neighbour of flat
+    cell i in direction d. Built once per board size and then shared."""
+    table = _NEIGHBOR_TABLES.get((H, W))
+    if table is None:
+        idx = np.arange(H * W, dtype=np.int32).reshape(H, W)
+        table = np.stack([
+            np.roll(idx, 1, axis=0).ravel(),   # UP    -> (x, y-1)
+            np.roll(idx, -1, axis=1).ravel(),  # RIGHT -> (x+1, y)
+            np.roll(idx, -1, axis=0).ravel(),  # DOWN  -> (x, y+1)
+            np.roll(idx, 1, axis=1).ravel(),   # LEFT  -> (x-1, y)
+        ])
+        _NEIGHBOR_TABLES[(H, W)] = table
+    return table
+
+
+@njit(cache=True, boundscheck=False)
+def _bfs_count(free, nbr, start, limit, visited, queue):
+    """BFS over empty cells from flat index start; visited is left all-zero."""
+    if free[start] == 0:
+        return 0
+    visited[start] = 1
+    queue[0] = start
+    head = 0
+    tail = 1
+    while head < tail:
+        v = queue[head]
+        head += 1
+        for d in range(4):
+            n = nbr[d, v]
+            if visited[n] == 0 and free[n] != 0:
+                visited[n] = 1
+                queue[tail] = n
+                tail += 1
+                if limit > 0 and tail >= limit:
+                    head = tail
+                    break
+    # Only the queued cells were marked, so clearing them resets the scratch.
+    for i in range(tail):
+        visited[queue[i]] = 0
+    return tail
+
+
+def _bfs_count_py(free, nbr, start, limit, visited, queue):
+    """_bfs_count for when Numba is unavailable.
+
+    Uses a bytes copy of the free mask, list copies of the neighbour table, a
+    bytearray seen mask and an int array queue, which are much cheaper than
+    per-element ndarray access from Python. The scratch arguments are
+    accepted for signature parity only.
+    """
+    cells = free.tobytes()
+    if not cells[start]:
+        return 0
+    tables = nbr.tolist()
+    seen = bytearray(len(cells))
+    seen[start] = 1
+    q = array("i", [start])
+    head = 0
+    while head < len(q):
+        v = q[head]
+        head += 1
+        for t in tables:
+            n = t[v]
+            if not seen[n] and cells[n]:
+                seen[n] = 1
+                q.append(n)
+                if 0 < limit <= len(q):
+                    return len(q)
+    return len(q)
+
+
+if not HAVE_NUMBA:
+    _bfs_count = _bfs_count_py
+
+
+@njit(cache=True, boundscheck=False, parallel=True)
+def score_all_moves(free, nbr, hx, hy, ox, oy, my_dir, opp_dir, voronoi):
+    """Score the four moves from head (hx, hy) against an opponent at (ox, oy).
+
+    Returns a float64[4] indexed by direction. The reverse of my_dir scores
+    -inf, a move into an occupied cell scores CRASH_SCORE, anything else is
+    flood-fill area + Voronoi territory + head-on danger + straight bonus.
+    opp_dir is -1 when the opponent's heading is unknown and nbr is
+    neighbor_table(H, W). With voronoi=False the territory term is skipped
+    (scored as 0). The directions are scored in parallel.
+    """
+    H, W = free.shape
+    flat = free.ravel()
+    scores = np.full(4, -np.inf)
+
+    # Cells the opponent can step into next tick (it cannot reverse)
+    opp = oy * W + ox
+    opp_future = np.full(4, -1, np.int64)
+    for od in range(4):
+        if opp_dir >= 0 and od == (opp_dir + 2) % 4:
+            continue
+        opp_future[od] = nbr[od, opp]
+
+    # Torus-Manhattan distance from every cell to the opponent's head
+    opp_dist = np.empty(H * W, np.int64)
+    for y in range(H):
+        dy = abs(y - oy)
+        dy = min(dy, H - dy)
+        row = y * W
+        for x in range(W):
+            dx = abs(x - ox)
+            opp_dist[row + x] = dy + min(dx, W - dx)
+
+    head = hy * W + hx
+    for d in prange(4):
+        n = nbr[d, head]
+        if d == (my_dir + 2) % 4:
+            pass
+        elif flat[n] == 0:
+            scores[d] = CRASH_SCORE
+        else:
+            # Per-iteration scratch so each thread owns its BFS buffers
+            visited = np.zeros(H * W, np.uint8)
+            queue = np.empty(H * W, np.int32)
+            area = _bfs_count(flat, nbr, n, AREA_LIMIT, visited, queue)
+
+            # Voronoi: empty cells strictly closer to n than to the opponent
+            ny = n // W
+            nx = n - ny * W
+            vscore = 0
+            if voronoi:
+                for y in range(H):
+                    dy = abs(y - ny)
+                    dy = min(dy, H - dy)
+                    row = y * W
+                    for x in range(W):
+                        i = row + x
+                        if flat[i] != 0:
+                            dx = abs(x - nx)
+                            if dy + min(dx, W - dx) < opp_dist[i]:
+                                vscore += 1
+
+            danger = 0.0
+            for k in range(4):
+                if opp_future[k] == n:
+                    danger = HEADON_PENALTY
+            straight_bonus = STRAIGHT_BONUS if d == my_dir else 0.0
+
+            scores[d] = W_AREA * area + W_VORONOI * vscore + danger + straight_bonus
+    return scores
+
+
+# -------------- AgentC kernels -----------------
+
+# AgentC's move order: UP, DOWN, LEFT, RIGHT
+AGENTC_DX = np.array([0, 0, -1, 1])
+AGENTC_DY = np.array([-1, 1, 0, 0])
+# Score of a move space_lookahead does not consider
+NO_SCORE = np.iinfo(np.int32).min
+# Per-move fields filled by evaluate_candidates
+CANDIDATE_DTYPE = np.dtype([
+    ("safe", "?"), ("d_opp", "i4"), ("d_pred", "i4"),
+    ("danger", "?"), ("closing", "?"),
+])
+
+
+@njit(cache=True, boundscheck=False)
+def _space_count(cells, H, W, start, budget, visited, queue, stamp):
+    """Capped BFS behind available_space over the flat occupancy grid cells.
+
+    visited and queue are caller-owned scratch of H*W int32. A cell counts
+    as visited when visited[i] == stamp, so callers reuse the buffers across
+    searches by passing a new stamp each time instead of clearing them.
+    """
+    n = H * W
+    visited[start] = stamp
+    queue[0] = start
+    head = 0
+    tail = 1
+    while head < tail:
+        v = queue[head]
+        head += 1
+        if head >= budget:
+            break
+        y = v // W
+        x = v - y * W
+        # Torus wrap by comparison instead of a modulo per neighbour
+        row = v - x
+        up = v - W if y > 0 else v + n - W
+        down = v + W if y < H - 1 else x
+        left = v - 1 if x > 0 else row + W - 1
+        right = v + 1 if x < W - 1 else row
+        for i in (up, down, left, right):
+            if visited[i] != stamp:
+                visited[i] = stamp
+                if cells[i] == 0:
+                    queue[tail] = i
+                    tail += 1
+    return head
+
+
+_EDGE_MASKS = {}
+
+
+def _space_count_py(cells, H, W, start, budget, visited, queue, stamp):
+    """_space_count for when Numba is unavailable.
+
+    Floods the whole board at once as a Python-int bitboard (bit y*W + x):
+    each step ORs the reached set shifted one cell in every direction, with
+    the first/last column bits rotated across the row for the torus wrap and
+    whole-row shifts wrapping at the board ends. Counting min(reached,
+    budget) gives the same result as the capped BFS since the BFS pops every
+    reachable cell until it hits the budget. Reached cells get stamp in
+    visited (when given) so callers can still tell which cells the count
+    depended on; queue is accepted for signature parity only.
+    """
+    H, W = int(H), int(W)
+    n = H * W
+    masks = _EDGE_MASKS.get((H, W))
+    if masks is None:
+        first = np.tile(np.arange(W) == 0, H)
+        col0 = int.from_bytes(np.packbits(first, bitorder="little").tobytes(), "little")
+        masks = _EDGE_MASKS[(H, W)] = (col0, col0 << (W - 1), (1 << n) - 1)
+    col0, col_last, full = masks
+    free = int.from_bytes(np.packbits(cells == 0, bitorder="little").tobytes(), "little")
+
+    reached = 1 << int(start)
+    while True:
+        grow = (((reached & ~col_last) << 1) | ((reached & col_last) >> (W - 1))
+                | ((reached & ~col0) >> 1) | ((reached & col0) << (W - 1))
+                | (reached << W) | (reached >> (n - W))
+                | (reached >> W) | (reached << (n - W)))
+        new = reached | (grow & free & full)
+        if new == reached:
+            break
+        reached = new
+        if reached.bit_count() >= budget:
+            break
+    if visited is not None:
+        bits = np.unpackbits(np.frombuffer(reached.to_bytes((n + 7) // 8, "little"), np.uint8),
+                             bitorder="little")[:n]
+        visited[bits.view(np.bool_)] = stamp
+    return min(reached.bit_count(), budget)
+
+
+if not HAVE_NUMBA:
+    _space_count = _space_count_py
+
+
+@njit(cache=True, boundscheck=False)
+def available_space(occupied, sx, sy, budget):
+    """Cells reachable from (sx, sy) through unoccupied cells, start included,
+    capped at budget. The start itself is always counted and expanded."""
+    H, W = occupied.shape
+    n = H * W
+    visited = np.zeros(n, np.int32)
+    queue = np.empty(n, np.int32)
+    return _space_count(occupied.ravel(), H, W, sy * W + sx, budget, visited, queue, 1)
+
+
+@njit(cache=True, boundscheck=False)
+def evaluate_candidates(occupied, hx, hy, ox, oy, px, py, reverse,
+                        avoid_head_on, out):
+    """Fill AgentC's per-move candidate table out (length 4, AgentC's move
+    order) for a head at (hx, hy), an opponent at (ox, oy) predicted to move
+    to (px, py). reverse is the index of the move that would reverse the
+    current heading, or -1 if there is none.
+
+    safe excludes reversing and blocked cells; the opponent's head counts as
+    safe unless avoid_head_on. danger marks cells within one step of the
+    opponent's current or predicted head (its possible next cells included).
+    closing is set when continuing straight after the move gets closer to
+    (px, py).
+    """
+    H, W = occupied.shape
+    for d in range(4):
+        dx = AGENTC_DX[d]
+        dy = AGENTC_DY[d]
+        nx = (hx + dx) % W
+        ny = (hy + dy) % H
+        if d == reverse:
+            safe = False
+        elif nx == ox and ny == oy:
+            safe = not avoid_head_on
+        else:
+            safe = not occupied[ny, nx]
+
+        ax = abs(nx - ox)
+        ay = abs(ny - oy)
+        d_opp = min(ax, W - ax) + min(ay, H - ay)
+        ax = abs(nx - px)
+        ay = abs(ny - py)
+        d_pred = min(ax, W - ax) + min(ay, H - ay)
+        ax = abs((nx + dx) % W - px)
+        ay = abs((ny + dy) % H - py)
+
+        rec = out[d]
+        rec["safe"] = safe
+        rec["d_opp"] = d_opp
+        rec["d_pred"] = d_pred
+        rec["danger"] = d_opp <= 1 or d_pred <= 1
+        rec["closing"] = min(ax, W - ax) + min(ay, H - ay) < d_pred
+    return out
+
+
+def _evaluate_candidates_py(occupied, hx, hy, ox, oy, px, py, reverse,
+                            avoid_head_on, out):
+    """evaluate_candidates for when Numba is unavailable.
+
+    Scores the four candidates as arrays instead of per-element loops, with a
+    single fancy index into the grid for their safety.
+    """
+    H, W = occupied.shape
+    nx = (hx + AGENTC_DX) % W
+    ny = (hy + AGENTC_DY) % H
+    on_head = (nx == ox) & (ny == oy)
+    safe = occupied[ny, nx] == 0
+    if avoid_head_on:
+        safe &= ~on_head
+    else:
+        safe |= on_head
+    if reverse >= 0:
+        safe[reverse] = False
+
+    d_opp = _torus_dist_vec(nx, ny, ox, oy, W, H)
+    d_pred = _torus_dist_vec(nx, ny, px, py, W, H)
+    out["safe"] = safe
+    out["d_opp"] = d_opp
+    out["d_pred"] = d_pred
+    out["danger"] = (d_opp <= 1) | (d_pred <= 1)
+    out["closing"] = _torus_dist_vec((nx + AGENTC_DX) % W, (ny + AGENTC_DY) % H, px, py, W, H) < d_pred
+    return out
+
+
+def _torus_dist_vec(xs, ys, x, y, W, H):
+    ax = np.abs(xs - x)
+    ay = np.abs(ys - y)
+    return np.minimum(ax, W - ax) + np.minimum(ay, H - ay)
+
+
+if not HAVE_NUMBA:
+    evaluate_candidates = _evaluate_candidates_py
+
+
+@njit(cache=True, boundscheck=False)
+def space_lookahead(occupied, hx, hy, ox, oy, safe, opp_reverse, budget):
+    """Two-ply alpha-beta over AgentC's moves and the opponent's replies.
+
+    For each move d with safe[d], the value is the worst case over the
+    opponent's replies (all but opp_reverse, -1 for none) of
+    available_space for us minus available_space for the opponent, both
+    capped at budget, after the two moves. Moving onto the same cell is a
+    head-on crash and scores 0; a move the opponent has no safe reply to
+    scores budget. Returns an int32[4] in AgentC's move order, NO_SCORE for
+    moves that are not safe. Moves cut off by alpha-beta get an upper bound
+    no better than an earlier move, so the first argmax is still exact.
+    occupied is modified during the search and restored before returning.
+
+    A cell a capped search never stamped cannot change its count, so each
+    leaf reuses one search per move for our side and one per reply for the
+    opponent's (run before either of us moves) unless the other head's new
+    cell was seen by it.
+    """
+    H, W = occupied.shape
+    n = H * W
+    cells = occupied.ravel()
+    # One set of BFS scratch for every leaf, told apart by stamp
+    visited = np.zeros(n, np.int32)
+    queue = np.empty(n, np.int32)
+    stamp = 0
+    reply = np.full(4, -1, np.int32)
+    opp_space = np.zeros(4, np.int32)
+    opp_saw = np.zeros((4, 4), np.bool_)
+    for r in range(4):
+        if r == opp_reverse:
+            continue
+        rx = (ox + AGENTC_DX[r]) % W
+        ry = (oy + AGENTC_DY[r]) % H
+        if occupied[ry, rx]:
+            continue
+        reply[r] = ry * W + rx
+        stamp += 1
+        opp_space[r] = _space_count(cells, H, W, reply[r], budget, visited, queue, stamp)
+        for d in range(4):
+            mi = ((hy + AGENTC_DY[d]) % H) * W + (hx + AGENTC_DX[d]) % W
+            opp_saw[r, d] = visited[mi] == stamp
+    my_saw = np.zeros(4, np.bool_)
+    scores = np.full(4, NO_SCORE, np.int32)
+    alpha = NO_SCORE
+    for d in range(4):
+        if not safe[d]:
+            continue
+        mx = (hx + AGENTC_DX[d]) % W
+        my = (hy + AGENTC_DY[d]) % H
+        saved = occupied[my, mx]
+        occupied[my, mx] = 1
+        stamp += 1
+        my_space = _space_count(cells, H, W, my * W + mx, budget, visited, queue, stamp)
+        for r in range(4):
+            my_saw[r] = reply[r] >= 0 and visited[reply[r]] == stamp
+        value = budget + 1
+        for r in range(4):
+            if r == opp_reverse:
+                continue
+            rx = (ox + AGENTC_DX[r]) % W
+            ry = (oy + AGENTC_DY[r]) % H
+            if rx == mx and ry == my:
+                leaf = 0
+            elif reply[r] < 0:
+                continue
+            else:
+                occupied[ry, rx] = 1
+                theirs = opp_space[r]
+                if opp_saw[r, d]:
+                    stamp += 1
+                    theirs = _space_count(cells, H, W, reply[r], budget, visited, queue, stamp)
+                leaf = my_space - theirs
+                if my_saw[r]:
+                    # Only a leaf below value matters, so stop our search
+                    # once it has enough space to reach value
+                    cutoff = min(budget, value + theirs)
+                    stamp += 1
+                    leaf = _space_count(cells, H, W, my * W + mx, cutoff, visited, queue, stamp) - theirs
+                occupied[ry, rx] = 0
+            if leaf < value:
+                value = leaf
+                if value <= alpha:
+                    break
+        occupied[my, mx] = saved
+        if value > budget:
+            value = budget
+        scores[d] = value
+        if value > alpha:
+            alpha = value
+    return scores
+
+
+# -------------- AgentS kernels -----------------
+
+@njit(cache=True, boundscheck=False)
+def candidate_areas(occupied, cx, cy, limit):
+    """available_space from each candidate cell (cx[j], cy[j]), capped at limit.
+
+    A free candidate that an earlier candidate's search reached is in the
+    same component, so it reuses that count instead of searching again.
+    """
+    H, W = occupied.shape
+    n = H * W
+    cells = occupied.ravel()
+    visited = np.zeros(n, np.int32)
+    queue = np.empty(n, np.int32)
+    k = cx.shape[0]
+    areas = np.zeros(k, np.int32)
+    for j in range(k):
+        start = cy[j] * W + cx[j]
+        # Search j stamps the cells it sees with j + 1
+        seen_by = visited[start]
+        if seen_by and cells[start] == 0:
+            areas[j] = areas[seen_by - 1]
+        else:
+            areas[j] = _space_count(cells, H, W, start, limit, visited, queue, j + 1)
+    return areas
+
+
+@njit(cache=True, boundscheck=False)
+def _voronoi_pair(occupied, mx, my, ox, oy):
+    """Unoccupied cells strictly closer to (mx, my) than to (ox, oy) by
+    torus-Manhattan distance.
+
+    The distance splits into a column and a row part, so a cell (x, y) is
+    closer to us exactly when diff_x[x] + diff_y[y] < 0, where diff_x and
+    diff_y are our per-column and per-row distance minus the opponent's.
+    The two difference maps cost W + H work; the sweep is then one compare
+    per cell.
+    """
+    H, W = occupied.shape
+    diff_x = np.empty(W, np.int64)
+    for x in range(W):
+        ax = abs(x - mx)
+        bx = abs(x - ox)
+        diff_x[x] = (ax if ax + ax <= W else W - ax) - (bx if bx + bx <= W else W - bx)
+    count = 0
+    for y in range(H):
+        ay = abs(y - my)
+        by = abs(y - oy)
+        bound = (by if by + by <= H else H - by) - (ay if ay + ay <= H else H - ay)
+        for x in range(W):
+            if occupied[y, x] == 0 and diff_x[x] < bound:
+                count += 1
+    return count
+
+
+_AXIS_DISTS = {}
+
+
+def _axis_dists(n):
+    """(n, n) table of wrapped distances between positions on an axis of length n."""
+    table = _AXIS_DISTS.get(n)
+    if table is None:
+        a = np.abs(np.arange(n)[:, None] - np.arange(n))
+        table = _AXIS_DISTS[n] = np.minimum(a, n - a)
+    return table
+
+
+def _voronoi_pair_py(occupied, mx, my, ox, oy):
+    """_voronoi_pair with the difference maps read from cached distance tables."""
+    H, W = occupied.shape
+    tx, ty = _axis_dists(W), _axis_dists(H)
+    diff_x = tx[mx] - tx[ox]
+    diff_y = ty[my] - ty[oy]
+    return int(np.count_nonzero((diff_x + diff_y[:, None] < 0) & (occupied == 0)))
+
+
+if not HAVE_NUMBA:
+    _voronoi_pair = _voronoi_pair_py
+
+
+@njit(cache=True, boundscheck=False)
+def voronoi_counts(occupied, cx, cy, ox, oy):
+    """_voronoi_pair of each candidate cell (cx[j], cy[j]) against the
+    opponent at (ox, oy)."""
+    k = cx.shape[0]
+    counts = np.zeros(k, np.int32)
+    for j in range(k):
+        counts[j] = _voronoi_pair(occupied, cx[j], cy[j], ox, oy)
+    return counts
+
+
+def _voronoi_counts_py(occupied, cx, cy, ox, oy):
+    """voronoi_counts for every candidate at once as a (k, H, W) broadcast."""
+    H, W = occupied.shape
+    tx, ty = _axis_dists(W), _axis_dists(H)
+    diff_x = tx[cx] - tx[ox]
+    diff_y = ty[cy] - ty[oy]
+    closer = diff_x[:, None, :] + diff_y[:, :, None] < 0
+    return np.count_nonzero(closer & (occupied == 0), axis=(1, 2)).astype(np.int32)
+
+
+if not HAVE_NUMBA:
+    voronoi_counts = _voronoi_counts_py
+
+
+@njit(cache=True, boundscheck=False)
+def reply_minimum(occupied, cx, cy, base, ox, oy, opp_reverse, limit,
+                  w_area, w_voronoi):
+    """Two-ply alpha-beta over AgentS's candidate cells and the opponent's replies.
+
+    Candidate j's value is base[j] plus the worst case over the opponent's
+    replies of w_area * available_space from (cx[j], cy[j]) capped at limit
+    plus w_voronoi * its Voronoi count against the reply cell, with both
+    cells blocked. Replies are the opponent's moves from (ox, oy) in AgentC's
+    move order, except opp_reverse (-1 for none), into a free cell other
+    than the candidate. With no such reply the opponent is scored as
+    standing still. Candidates cut off by alpha-beta get an upper bound no
+    better than an earlier candidate, so the first argmax is still exact.
+    A candidate whose base plus the largest possible area and Voronoi terms
+    (every free cell) is already no better is cut off before any search;
+    this needs w_area and w_voronoi to be non-negative. occupied is modified
+    during the search and restored before returning.
+    """
+    H, W = occupied.shape
+    n = H * W
+    cells = occupied.ravel()
+    free = n - np.count_nonzero(cells)
+    best_terms = w_area * min(limit, free) + w_voronoi * free
+    visited = np.zeros(n, np.int32)
+    queue = np.empty(n, np.int32)
+    stamp = 0
+    saw = np.zeros(4, np.bool_)
+    k = cx.shape[0]
+    values = np.empty(k, np.float64)
+    alpha = -np.inf
+    for j in range(k):
+        if base[j] + best_terms <= alpha:
+            values[j] = base[j] + best_terms
+            continue
+        mx = cx[j]
+        my = cy[j]
+        mi = my * W + mx
+        saved = cells[mi]
+        cells[mi] = 1
+        stamp += 1
+        # Our area only changes with a reply cell this search saw
+        my_space = _space_count(cells, H, W, mi, limit, visited, queue, stamp)
+        for r in range(4):
+            ri = ((oy + AGENTC_DY[r]) % H) * W + (ox + AGENTC_DX[r]) % W
+            saw[r] = visited[ri] == stamp
+        worst = np.inf
+        replied = False
+        for r in range(4):
+            if r == opp_reverse:
+                continue
+            rx = (ox + AGENTC_DX[r]) % W
+            ry = (oy + AGENTC_DY[r]) % H
+            ri = ry * W + rx
+            if cells[ri]:
+                continue
+            replied = True
+            cells[ri] = 1
+            area = my_space
+            if saw[r]:
+                stamp += 1
+                area = _space_count(cells, H, W, mi, limit, visited, queue, stamp)
+            leaf = w_area * area + w_voronoi * _voronoi_pair(occupied, mx, my, rx, ry)
+            cells[ri] = 0
+            if leaf < worst:
+                worst = leaf
+                if base[j] + worst <= alpha:
+                    break
+        if not replied:
+            worst = w_area * my_space + w_voronoi * _voronoi_pair(occupied, mx, my, ox, oy)
+        cells[mi] = saved
+        values[j] = base[j] + worst
+        if values[j] > alpha:
+            alpha = values[j]
+    return values
+
+
+def warmup():
+    """Compile the kernels on a tiny board so the first real move doesn't pay
+    for JIT compilation. With cache=True this also persists them on disk."""
+    free = np.ones((4, 4), np.uint8)
+    nbr = neighbor_table(4, 4)
+    score_all_moves(free, nbr, 0, 0, 2, 2, 1, -1, True)
+    occupied = np.zeros((4, 4), np.uint8)
+    available_space(occupied, 0, 0, 8)
+    cand = evaluate_candidates(occupied, 0, 0, 2, 2, 2, 3, 2, True, np.zeros(4, CANDIDATE_DTYPE))
+    space_lookahead(occupied, 0, 0, 2, 2, cand["safe"], 0, 8)
+    cx = np.array([0, 1])
+    candidate_areas(occupied, cx, cx, 8)
+    voronoi_counts(occupied, cx, cx, 2, 2)
+    reply_minimum(occupied, cx, cx, np.zeros(2), 2, 2, 0, 8, 1.0, 1.0)
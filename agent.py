@@ -9,6 +9,7 @@ from collections import deque
 from agentw import AgentW
 from agents import AgentS
 from agentc import AgentC
+from _accelerated import warmup
 
 app = Flask(__name__)
 
@@ -82,5 +83,6 @@ def end_game():
 if __name__ == "__main__":
     # For development only. Port can be overridden with the PORT env var.
     port = int(os.environ.get("PORT", "5008"))
+    warmup()
     print(f"Starting {AGENT_NAME} ({PARTICIPANT}) on port {port}...")
     app.run(host="0.0.0.0", port=port, debug=False)
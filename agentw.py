@@ -3,27 +3,42 @@
 # Outputs moves as "UP"/"DOWN"/"LEFT"/"RIGHT" or "DIR:BOOST" (all caps).
 # Minimal: choose_action + supporting helpers.
 
-import collections
 import random
 
+import numpy as np
+
+from _accelerated import available_space
+
 ROWS = 18  # number of rows (y)
 COLS = 20  # number of columns (x)
 
-# Directions are (dx, dy) because positions are (x, y)
-DIRS = {
-    "UP": (0, -1),
-    "DOWN": (0, 1),
-    "LEFT": (-1, 0),
-    "RIGHT": (1, 0),
-}
-DIR_NAMES = list(DIRS.keys())
-OPPOSITE = {"UP": "DOWN", "DOWN": "UP", "LEFT": "RIGHT", "RIGHT": "LEFT"}
+# Directions are ints indexing DXDY, whose entries are (dx, dy) because
+# positions are (x, y). DIR_NAMES turns them into move strings at the exit.
+UP, DOWN, LEFT, RIGHT = range(4)
+DXDY = ((0, -1), (0, 1), (-1, 0), (1, 0))
+DIR_NAMES = ("UP", "DOWN", "LEFT", "RIGHT")
+OPPOSITE = (DOWN, UP, RIGHT, LEFT)
+
+
+def _four_neighbors(idx):
+    y, x = divmod(idx, COLS)
+    return tuple(((y + dy) % ROWS) * COLS + (x + dx) % COLS for dx, dy in DXDY)
+
+
+# Torus neighbours of every flat cell index y*COLS + x, in direction order
+NEIGH = tuple(_four_neighbors(i) for i in range(ROWS * COLS))
+# (x, y) position of every flat cell index
+CELLS = tuple((i % COLS, i // COLS) for i in range(ROWS * COLS))
 
 
 class AgentW:
     def __init__(self, rng_seed=None):
         if rng_seed is not None:
             random.seed(rng_seed)
+        # Occupied map carried across turns, see occupied()
+        self._occ = None
+        self._trail_lens = (0, 0)
+        self._trail_starts = (None, None)
 
     # --- coordinate helpers (positions are (x, y)) ---
     @staticmethod
@@ -34,9 +49,14 @@ class AgentW:
     def pos_to_tuple(p):
         return (int(p[0]), int(p[1]))
 
+    @staticmethod
+    def cell_index(pos):
+        """Flat index y*COLS + x of an (x, y) position."""
+        return pos[1] * COLS + pos[0]
+
     @staticmethod
     def simulate_step(pos, direction, steps=1):
-        dx, dy = DIRS[direction]
+        dx, dy = DXDY[direction]
         x, y = pos
         return AgentW.wrap(x + dx * steps, y + dy * steps)
 
@@ -52,9 +72,10 @@ class AgentW:
     def build_occupied_set(state):
         """
         Board is a matrix indexed [row][col] but positions are (x,y) = (col,row).
-        Add board cells with 1 plus both trails.
+        Returns a bytearray(ROWS*COLS) indexed by cell_index, 1 for board cells
+        with 1 plus both trails.
         """
-        occ = set()
+        occ = bytearray(ROWS * COLS)
         board = AgentW._safe_get_board(state)
         try:
             for y in range(min(ROWS, len(board))):
@@ -62,7 +83,7 @@ class AgentW:
                 for x in range(min(COLS, len(row))):
                     try:
                         if row[x] == 1:
-                            occ.add((x, y))
+                            occ[y * COLS + x] = 1
                     except Exception:
                         continue
         except Exception:
@@ -72,11 +93,36 @@ class AgentW:
             trail = state.get(key, []) or []
             for p in trail:
                 try:
-                    occ.add(AgentW.pos_to_tuple(p))
+                    occ[AgentW.cell_index(AgentW.pos_to_tuple(p))] = 1
                 except Exception:
                     continue
         return occ
 
+    def occupied(self, state):
+        """
+        build_occupied_set, updated in place from turn to turn.
+        Trails only grow, so while both trails extend the ones seen last
+        turn just their new cells are marked; a shorter trail or a different
+        first cell means a new game and the map is rebuilt. Callers must
+        copy the result before modifying it.
+        """
+        trails = [state.get(key, []) or [] for key in ("agent1_trail", "agent2_trail")]
+        lens = tuple(len(t) for t in trails)
+        starts = tuple(tuple(t[0]) if t else None for t in trails)
+        if (self._occ is None or starts != self._trail_starts
+                or any(n < old for n, old in zip(lens, self._trail_lens))):
+            self._occ = AgentW.build_occupied_set(state)
+        else:
+            for trail, old in zip(trails, self._trail_lens):
+                for p in trail[old:]:
+                    try:
+                        self._occ[AgentW.cell_index(AgentW.pos_to_tuple(p))] = 1
+                    except Exception:
+                        continue
+        self._trail_lens = lens
+        self._trail_starts = starts
+        return self._occ
+
     @staticmethod
     def head_positions(state):
         def head_from_trail(trail):
@@ -90,24 +136,16 @@ class AgentW:
 
     @staticmethod
     def neighbors(pos):
-        x, y = pos
-        for dx, dy in DIRS.values():
-            yield AgentW.wrap(x + dx, y + dy)
+        return [CELLS[n] for n in NEIGH[AgentW.cell_index(pos)]]
 
     @staticmethod
     def flood_fill_area(start, occ, max_nodes=ROWS * COLS):
-        if start is None or start in occ:
+        if start is None:
             return 0
-        q = collections.deque([start])
-        seen = {start}
-        while q and len(seen) < max_nodes:
-            cur = q.popleft()
-            for n in AgentW.neighbors(cur):
-                if n in seen or n in occ:
-                    continue
-                seen.add(n)
-                q.append(n)
-        return len(seen)
+        if occ[AgentW.cell_index(start)]:
+            return 0
+        grid = np.frombuffer(occ, np.uint8).reshape(ROWS, COLS)
+        return int(available_space(grid, start[0], start[1], max_nodes))
 
     # --- trail helpers to prevent reversing into the most recent previous cell ---
     @staticmethod
@@ -134,35 +172,51 @@ class AgentW:
 
     # --- propose candidate moves (exclude moves that step into prev_pos) ---
     @staticmethod
-    def propose_moves(state):
+    def propose_moves(state, occ=None):
         me_num = int(state.get("player_number", 1))
         a1_head, a2_head = AgentW.head_positions(state)
         my_head = a1_head if me_num == 1 else a2_head
         opp_head = a2_head if me_num == 1 else a1_head
-        occ = AgentW.build_occupied_set(state)
+        if occ is None:
+            occ = AgentW.build_occupied_set(state)
         boosts_left = int(state.get("agent1_boosts", 0) if me_num == 1 else state.get("agent2_boosts", 0))
 
         last_pos, prev_pos = AgentW.last_positions(state)
 
-        candidates = []
+        # Candidates as parallel lists indexed by candidate id:
+        # direction, resulting cell, whether it boosts, whether it is dead
+        dirs, cells, boosted, dead = [], [], [], []
+        candidates = (dirs, cells, boosted, dead)
         if my_head is None:
-            for d in DIR_NAMES:
-                candidates.append((d, None, False, False))
+            dirs.extend(range(4))
+            cells.extend([None] * 4)
+            boosted.extend([False] * 4)
+            dead.extend([False] * 4)
             return candidates, my_head, opp_head, occ, boosts_left
 
-        for d in DIR_NAMES:
+        for d in range(4):
             nxt = AgentW.simulate_step(my_head, d, steps=1)
-            dead_single = (nxt in occ) or (prev_pos is not None and nxt == prev_pos)
-            candidates.append((d, nxt, False, dead_single))
+            dirs.append(d)
+            cells.append(nxt)
+            boosted.append(False)
+            dead.append(bool(occ[AgentW.cell_index(nxt)]) or (prev_pos is not None and nxt == prev_pos))
 
             if boosts_left > 0:
-                mid = AgentW.simulate_step(my_head, d, steps=1)
+                mid = nxt
                 final = AgentW.simulate_step(my_head, d, steps=2)
-                dead_boost = (mid in occ) or (final in occ) or (prev_pos is not None and (mid == prev_pos or final == prev_pos))
-                candidates.append((d + ":BOOST", final, True, dead_boost))
+                dirs.append(d)
+                cells.append(final)
+                boosted.append(True)
+                dead.append(bool(occ[AgentW.cell_index(mid)] or occ[AgentW.cell_index(final)])
+                            or (prev_pos is not None and (mid == prev_pos or final == prev_pos)))
 
         return candidates, my_head, opp_head, occ, boosts_left
 
+    @staticmethod
+    def move_name(direction, used_boost):
+        name = DIR_NAMES[direction]
+        return f"{name}:BOOST" if used_boost else name
+
     @staticmethod
     def head_on_survivor(my_len, opp_len):
         if my_len > opp_len:
@@ -173,75 +227,53 @@ class AgentW:
 
     # --- top-level chooser ---
     def choose_action(self, game_state, boost_threshold=1.30):
-        candidates, my_head, opp_head, occ, boosts_left = AgentW.propose_moves(game_state)
+        candidates, my_head, opp_head, occ, boosts_left = AgentW.propose_moves(game_state, self.occupied(game_state))
+        dirs, cells, boosted, dead = candidates
 
         if my_head is None:
             return random.choice(DIR_NAMES)
 
         opp_one_step = set()
         if opp_head is not None:
-            for d in DIR_NAMES:
+            for d in range(4):
                 opp_one_step.add(AgentW.simulate_step(opp_head, d, steps=1))
 
-        safe = []
-        for move_str, result_cell, used_boost, dead in candidates:
-            if dead:
-                continue
-            headon_risk = False
-            if result_cell in opp_one_step:
-                my_len = int(game_state.get("agent1_length", 0) if game_state.get("player_number", 1) == 1 else game_state.get("agent2_length", 0))
-                opp_len = int(game_state.get("agent2_length", 0) if game_state.get("player_number", 1) == 1 else game_state.get("agent1_length", 0))
-                survivor = AgentW.head_on_survivor(my_len, opp_len)
-                if survivor == "OPP" or survivor == "BOTH":
-                    headon_risk = True
-            safe.append((move_str, result_cell, used_boost, headon_risk))
-
+        safe = [i for i in range(len(dirs)) if not dead[i]]
         if not safe:
-            non_dead = [c for c in candidates if not c[3]]
-            if non_dead:
-                sel = non_dead[0][0].upper()
-                if sel.endswith(":BOOST"):
-                    dir_part = sel.split(":")[0]
-                    sel = f"{dir_part}:BOOST"
-                return sel
             return random.choice(DIR_NAMES)
 
-        scored = []
-        for move_str, result_cell, used_boost, headon_risk in safe:
-            occ2 = set(occ)
-            if result_cell is not None:
-                occ2.add(result_cell)
-            if used_boost:
-                base_dir = move_str.split(":")[0]
-                mid = AgentW.simulate_step(my_head, base_dir, steps=1)
-                occ2.add(mid)
+        me = game_state.get("player_number", 1)
+        my_len = int(game_state.get("agent1_length", 0) if me == 1 else game_state.get("agent2_length", 0))
+        opp_len = int(game_state.get("agent2_length", 0) if me == 1 else game_state.get("agent1_length", 0))
+        survivor = AgentW.head_on_survivor(my_len, opp_len)
+
+        # Per-candidate scores, indexed like the candidate lists
+        headon_risk = [False] * len(dirs)
+        area = [0] * len(dirs)
+        for i in safe:
+            result_cell = cells[i]
+            if result_cell in opp_one_step and survivor in ("OPP", "BOTH"):
+                headon_risk[i] = True
+            # Flood from the landing cell itself, so it must stay free in occ2;
+            # only a boost's intermediate cell becomes new trail first
+            occ2 = bytearray(occ)
+            if boosted[i]:
+                mid = AgentW.simulate_step(my_head, dirs[i], steps=1)
+                occ2[AgentW.cell_index(mid)] = 1
             start_for_area = result_cell if result_cell is not None else my_head
-            area = AgentW.flood_fill_area(start_for_area, occ2)
-            scored.append((area, headon_risk, used_boost, move_str))
+            area[i] = AgentW.flood_fill_area(start_for_area, occ2)
 
-        scored.sort(key=lambda x: (x[0], -int(x[2])), reverse=True)
+        scored = sorted(safe, key=lambda i: (area[i], -int(boosted[i])), reverse=True)
 
-        best_non_boost = next((s for s in scored if not s[2]), None)
-        best_boost = next((s for s in scored if s[2]), None)
+        best_non_boost = next((i for i in scored if not boosted[i]), None)
+        best_boost = next((i for i in scored if boosted[i]), None)
 
-        chosen = None
-        if best_non_boost and best_boost:
-            nb_area = best_non_boost[0]
-            b_area = best_boost[0]
-            if (b_area >= nb_area * boost_threshold) or (best_non_boost[1] and not best_boost[1]):
-                chosen = best_boost[3]
+        if best_non_boost is not None and best_boost is not None:
+            if (area[best_boost] >= area[best_non_boost] * boost_threshold) or (headon_risk[best_non_boost] and not headon_risk[best_boost]):
+                chosen = best_boost
             else:
-                chosen = best_non_boost[3]
+                chosen = best_non_boost
         else:
-            for area, headon_risk, used_boost, move_str in scored:
-                if not headon_risk:
-                    chosen = move_str
-                    break
-            if chosen is None:
-                chosen = scored[0][3]
-
-        chosen = chosen.upper()
-        if chosen.endswith(":BOOST"):
-            dir_part = chosen.split(":")[0]
-            chosen = f"{dir_part}:BOOST"
-        return chosen
\ No newline at end of file
+            chosen = next((i for i in scored if not headon_risk[i]), scored[0])
+
+        return AgentW.move_name(dirs[chosen], boosted[chosen])
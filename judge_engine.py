@@ -1,30 +1,71 @@
+import orjson
 import requests
 import sys
 import time
 import os
+from itertools import islice
+from concurrent.futures import ThreadPoolExecutor
 from case_closed_game import Game, Direction, GameResult
 import random
 
+_DIRECTIONS = (Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT)
+
 class RandomPlayer:
     def __init__(self, player_id=1):
         self.player_id = player_id
-    
-    def get_possible_moves(self):
-        """Returns list of all possible directions for agent."""
-        return [Direction.UP, Direction.DOWN, Direction.LEFT, Direction.RIGHT]
         
     def get_best_move(self):
         """Returns a random valid direction."""
-        possible_moves = self.get_possible_moves()
-        return random.choice(possible_moves)
+        return random.choice(_DIRECTIONS)
+
+MOVE_TIMEOUT = .1  # time for each move
+# State and end posts aren't part of the move budget: fail fast on connect,
+# but give the agent time to digest the state before calling it unreachable
+STATE_TIMEOUT = (.05, .5)  # (connect, read)
+END_TIMEOUT = 1.0
+JSON_HEADERS = {"Content-Type": "application/json"}
+# 0 silences the per-turn board and move printout; results and errors still print
+VERBOSE = int(os.getenv("JUDGE_VERBOSE", "1"))
+FULL_STATE_EVERY = 50  # turns between full snapshots for agents taking deltas
+
+# Move string <-> Direction tables used by handle_move
+DIRECTION_MAP = {
+    'UP': Direction.UP,
+    'DOWN': Direction.DOWN,
+    'LEFT': Direction.LEFT,
+    'RIGHT': Direction.RIGHT,
+}
+DIR_TO_STR = {v: k for k, v in DIRECTION_MAP.items()}
+MOVE_ABBREV = {'UP': 'U', 'DOWN': 'D', 'LEFT': 'L', 'RIGHT': 'R'}
+OPPOSITE = {
+    Direction.UP: Direction.DOWN,
+    Direction.DOWN: Direction.UP,
+    Direction.LEFT: Direction.RIGHT,
+    Direction.RIGHT: Direction.LEFT,
+}
+
+# end_game's announcement for each result
+_WINNER_MSGS = {
+    GameResult.AGENT1_WIN: lambda judge: f"Winner: Agent 1 ({judge.p1_agent.agent_name})",
+    GameResult.AGENT2_WIN: lambda judge: f"Winner: Agent 2 ({judge.p2_agent.agent_name})",
+    GameResult.DRAW: lambda judge: "Game ended in a draw",
+}
 
-TIMEOUT = .1  # time for each move
+
+def make_session():
+    """Session with a small keep-alive pool, so per-turn requests reuse a connection."""
+    session = requests.Session()
+    adapter = requests.adapters.HTTPAdapter(pool_connections=2, pool_maxsize=8, pool_block=False)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
 
 class PlayerAgent:
     def __init__(self, participant, agent_name):
         self.participant = participant
         self.agent_name = agent_name
         self.latency = None
+        self.state_deltas = False  # agent accepts delta state posts
 
 class Judge:
     def __init__(self, p1_url, p2_url):
@@ -33,54 +74,91 @@ class Judge:
         self.game = Game()
         self.p1_agent = None
         self.p2_agent = None
-        self.game_str = ""  # Track game moves as string
+        self.game_log = []  # Track game moves, one "1R-"-style token per move
+        # One keep-alive session per player so their connection pools stay separate
+        self.s1 = make_session()
+        self.s2 = make_session()
+        # Runs both players' requests side by side, moves are simultaneous anyway
+        self.pool = ThreadPoolExecutor(max_workers=4)
+        # Trail lengths each player last acknowledged, None until a full state lands
+        self._trails_sent = {1: None, 2: None}
+
+    @property
+    def game_str(self):
+        """Moves so far as one string"""
+        return "".join(self.game_log)
 
     def check_latency(self):
         """Check latency for both players and create their agents"""
-        # Check P1
-        try:
-            start_time = time.time()
-            response = requests.get(self.p1_url, timeout=TIMEOUT)
-            end_time = time.time()
-            
-            if response.status_code == 200:
-                data = response.json()
-                self.p1_agent = PlayerAgent(data.get("participant", "Participant1"), 
-                                     data.get("agent_name", "Agent1"))
-                self.p1_agent.latency = (end_time - start_time)
-            else:
-                return False
-                
-        except (requests.RequestException, requests.Timeout):
-            return False
+        # Ping both players at once; startup waits for the slower one only
+        f1 = self.pool.submit(self._check_one, self.s1, self.p1_url, 1)
+        f2 = self.pool.submit(self._check_one, self.s2, self.p2_url, 2)
+        self.p1_agent, self.p2_agent = f1.result(), f2.result()
+        return self.p1_agent is not None and self.p2_agent is not None
 
-        # Check P2
+    @staticmethod
+    def _check_one(session, url, player_num):
+        """Ping one player. Returns its PlayerAgent with latency set, or None."""
         try:
             start_time = time.time()
-            response = requests.get(self.p2_url, timeout=TIMEOUT)
+            response = session.get(url, timeout=MOVE_TIMEOUT)
             end_time = time.time()
             
-            if response.status_code == 200:
-                data = response.json()
-                self.p2_agent = PlayerAgent(data.get("participant", "Participant2"), 
-                                     data.get("agent_name", "Agent2"))
-                self.p2_agent.latency = (end_time - start_time)
-            else:
-                return False
+            if response.status_code != 200:
+                return None
+            data = response.json()
+            agent = PlayerAgent(data.get("participant", f"Participant{player_num}"), 
+                                data.get("agent_name", f"Agent{player_num}"))
+            agent.latency = (end_time - start_time)
+            agent.state_deltas = bool(data.get("state_deltas", False))
+            return agent
                 
         except (requests.RequestException, requests.Timeout):
-            return False
+            return None
 
-        return True
+    def send_state(self, player_num, snapshot=None):
+        """Send current game state to a player via POST
 
-    def send_state(self, player_num):
-        """Send current game state to a player via POST"""
+        Agents that advertise "state_deltas" get only the trail cells added
+        since their last acknowledged post (trails only grow, and those are the
+        only board cells that change), with a full snapshot every
+        FULL_STATE_EVERY turns or whenever a delta is rejected. snapshot is
+        this turn's _build_state_snapshot(), built here if not given.
+        """
         url = self.p1_url if player_num == 1 else self.p2_url
-        
-        state_data = {
+        session = self.s1 if player_num == 1 else self.s2
+        agent = self.p1_agent if player_num == 1 else self.p2_agent
+        trail1, trail2 = self.game.agent1.trail, self.game.agent2.trail
+        sent = self._trails_sent[player_num]
+        self._trails_sent[player_num] = None
+        fields, full = snapshot if snapshot is not None else self._build_state_snapshot()
+
+        if agent is not None and agent.state_deltas and sent is not None and self.game.turns % FULL_STATE_EVERY:
+            state_data = {
+                **fields,
+                "player_number": player_num,
+                "delta": True,
+                "agent1_trail_new": list(islice(trail1, sent[0], None)),
+                "agent2_trail_new": list(islice(trail2, sent[1], None)),
+            }
+            if self._post_state(session, url, state_data):
+                self._trails_sent[player_num] = (len(trail1), len(trail2))
+                return True
+
+        state_data = {**full, **fields, "player_number": player_num}
+        if self._post_state(session, url, state_data):
+            self._trails_sent[player_num] = (len(trail1), len(trail2))
+            return True
+        return False
+
+    def _build_state_snapshot(self):
+        """This turn's state as (scalar fields, full-state-only fields), shared by all posts"""
+        full = {
             "board": self.game.board.grid,
             "agent1_trail": self.game.agent1.get_trail_positions(),
             "agent2_trail": self.game.agent2.get_trail_positions(),
+        }
+        fields = {
             "agent1_length": self.game.agent1.length,
             "agent2_length": self.game.agent2.length,
             "agent1_alive": self.game.agent1.alive,
@@ -88,18 +166,29 @@ class Judge:
             "agent1_boosts": self.game.agent1.boosts_remaining,
             "agent2_boosts": self.game.agent2.boosts_remaining,
             "turn_count": self.game.turns,
-            "player_number": player_num,
         }
-        
+        return fields, full
+
+    @staticmethod
+    def _post_state(session, url, state_data):
         try:
-            response = requests.post(f"{url}/send-state", json=state_data, timeout=TIMEOUT)
+            response = session.post(f"{url}/send-state", data=orjson.dumps(state_data),
+                                    headers=JSON_HEADERS, timeout=STATE_TIMEOUT)
             return response.status_code == 200
         except (requests.RequestException, requests.Timeout):
             return False
 
+    def send_state_both(self):
+        """Send the current state to both players concurrently. True if both accepted it."""
+        snapshot = self._build_state_snapshot()
+        f1 = self.pool.submit(self.send_state, 1, snapshot)
+        f2 = self.pool.submit(self.send_state, 2, snapshot)
+        return f1.result() and f2.result()
+
     def get_move(self, player_num, attempt_number, random_moves_left):
         """Request a move from a player via GET with query parameters"""
         url = self.p1_url if player_num == 1 else self.p2_url
+        session = self.s1 if player_num == 1 else self.s2
         
         # Build query parameters for GET request
         params = {
@@ -111,7 +200,7 @@ class Judge:
         
         try:
             start_time = time.time()
-            response = requests.get(f"{url}/send-move", params=params, timeout=TIMEOUT)
+            response = session.get(f"{url}/send-move", params=params, timeout=MOVE_TIMEOUT)
             end_time = time.time()
             
             if player_num == 1:
@@ -120,43 +209,43 @@ class Judge:
                 self.p2_agent.latency = (end_time - start_time)
             
             if response.status_code == 200:
-                move = response.json()
+                move = orjson.loads(response.content)
                 return move.get('move')
             else:
                 return None
                 
-        except (requests.RequestException, requests.Timeout):
+        except (requests.RequestException, requests.Timeout, orjson.JSONDecodeError):
             return None
 
+    def fetch_move(self, player_num, random_moves_left):
+        """Request a move, retrying once. Returns (move or None, number of failed attempts)"""
+        for attempt in range(1, 3):  # 2 attempts
+            move = self.get_move(player_num, attempt, random_moves_left)
+            if move:
+                return move, attempt - 1
+        return None, 2
+
     def end_game(self, result):
         """End the game and notify both players"""
+        fields, full = self._build_state_snapshot()
         end_data = {
-            "board": self.game.board.grid,
-            "agent1_trail": self.game.agent1.get_trail_positions(),
-            "agent2_trail": self.game.agent2.get_trail_positions(),
-            "agent1_length": self.game.agent1.length,
-            "agent2_length": self.game.agent2.length,
-            "agent1_alive": self.game.agent1.alive,
-            "agent2_alive": self.game.agent2.alive,
-            "agent1_boosts": self.game.agent1.boosts_remaining,
-            "agent2_boosts": self.game.agent2.boosts_remaining,
-            "turn_count": self.game.turns,
+            **full,
+            **fields,
             "result": result.name if isinstance(result, GameResult) else str(result),
         }
         
+        body = orjson.dumps(end_data)
+        # Notify both players at once; result() re-raises a failed post here
+        f1 = self.pool.submit(self.s1.post, f"{self.p1_url}/end", data=body,
+                              headers=JSON_HEADERS, timeout=END_TIMEOUT)
+        f2 = self.pool.submit(self.s2.post, f"{self.p2_url}/end", data=body,
+                              headers=JSON_HEADERS, timeout=END_TIMEOUT)
         try:
-            requests.post(f"{self.p1_url}/end", json=end_data, timeout=TIMEOUT)
-            requests.post(f"{self.p2_url}/end", json=end_data, timeout=TIMEOUT)
+            f1.result()
+            f2.result()
             
-            if isinstance(result, GameResult):
-                if result == GameResult.AGENT1_WIN:
-                    print(f"Winner: Agent 1 ({self.p1_agent.agent_name})")
-                elif result == GameResult.AGENT2_WIN:
-                    print(f"Winner: Agent 2 ({self.p2_agent.agent_name})")
-                else:
-                    print("Game ended in a draw")
-            else:
-                print(f"Game ended: {result}")
+            announce = _WINNER_MSGS.get(result)
+            print(announce(self) if announce else f"Game ended: {result}")
         except (requests.RequestException, requests.Timeout):
             return False
 
@@ -174,43 +263,61 @@ class Judge:
         use_boost = len(move_parts) > 1 and move_parts[1] == 'BOOST'
         
         # Convert move string to Direction
-        direction_map = {
-            'UP': Direction.UP,
-            'DOWN': Direction.DOWN,
-            'LEFT': Direction.LEFT,
-            'RIGHT': Direction.RIGHT,
-        }
-        
-        if direction_str not in direction_map:
+        direction = DIRECTION_MAP.get(direction_str)
+        if direction is None:
             print(f"Invalid direction by Player {player_num}: {direction_str}")
             return "forfeit"
         
-        direction = direction_map[direction_str]
-        
         # Check if move is opposite to current direction (invalid move)
         agent = self.game.agent1 if player_num == 1 else self.game.agent2
         current_dir = agent.direction
         
         # Check if requested direction is opposite to current
-        cur_dx, cur_dy = current_dir.value
-        req_dx, req_dy = direction.value
-        if (req_dx, req_dy) == (-cur_dx, -cur_dy):
+        if OPPOSITE[current_dir] is direction:
             print(f"Player {player_num} attempted invalid move (opposite direction). Using current direction instead.")
             direction = current_dir
-            direction_str = {Direction.UP: 'UP', Direction.DOWN: 'DOWN', 
-                           Direction.LEFT: 'LEFT', Direction.RIGHT: 'RIGHT'}[direction]
+            direction_str = DIR_TO_STR[direction]
         
-        print(f"Player {player_num}'s move: {direction_str}{' (BOOST)' if use_boost else ''}{' (RANDOM)' if is_random else ''}")
+        if VERBOSE:
+            print(f"Player {player_num}'s move: {direction_str}{' (BOOST)' if use_boost else ''}{' (RANDOM)' if is_random else ''}")
         
         # Record move in game string with improved format
-        move_abbrev = {'UP': 'U', 'DOWN': 'D', 'LEFT': 'L', 'RIGHT': 'R'}
         boost_marker = 'B' if use_boost else ''
         random_marker = 'R' if is_random else ''
-        self.game_str += f"{player_num}{move_abbrev[direction_str]}{boost_marker}{random_marker}-"
+        self.game_log.append(f"{player_num}{MOVE_ABBREV[direction_str]}{boost_marker}{random_marker}-")
         
         return (True, use_boost, direction)  # Return tuple: (valid, boost_flag, direction)
             
 
+def acquire_move(judge, player_num, fetch, random_moves_left):
+    """Resolve a player's move for this turn from its fetch_move future.
+
+    Falls back to a random move while the player has some left.
+    Returns (direction, boost, random_moves_left), or None if the player forfeits.
+    """
+    if VERBOSE:
+        print(f"Requesting move from Player {player_num}...")
+    move, failed = fetch.result()
+    for attempt in range(1, failed + 1):
+        print(f"  Attempt {attempt} failed")
+    if move:
+        validation = judge.handle_move(move, player_num, is_random=False)
+        if validation == "forfeit":
+            print(f"Player {player_num} forfeited")
+            return None
+        return validation[2], validation[1], random_moves_left
+
+    # If both attempts failed, use random move or forfeit
+    if random_moves_left <= 0:
+        print(f"Player {player_num} has no random moves left. Forfeiting.")
+        return None
+    print(f"Using random move for Player {player_num} ({random_moves_left} random moves left)")
+    direction = random.choice(_DIRECTIONS)
+    # Convert Direction to string for handle_move
+    judge.handle_move(DIR_TO_STR[direction], player_num, is_random=True)
+    return direction, False, random_moves_left - 1  # Random moves don't use boost
+
+
 def main():
     print("Judge engine starting up, waiting for agents...")
     time.sleep(5)
@@ -234,7 +341,7 @@ def main():
     
     # Send initial state to both players
     print("Sending initial game state...")
-    if not judge.send_state(1) or not judge.send_state(2):
+    if not judge.send_state_both():
         print("Failed to send initial state")
         return
 
@@ -244,99 +351,41 @@ def main():
 
     # Game loop
     while True:
-        print(f"\n=== Turn {judge.game.turns + 1} ===")
-        
-        # Get moves from both players
-        p1_move = None
-        p2_move = None
-        p1_boost = False
-        p2_boost = False
-        
-        # Player 1 move
-        print("Requesting move from Player 1...")
-        for attempt in range(1, 3):  # 2 attempts
-            p1_move = judge.get_move(1, attempt, p1_random)
-            if p1_move:
-                validation = judge.handle_move(p1_move, 1, is_random=False)
-                if validation == "forfeit":
-                    print("Player 1 forfeited")
-                    judge.end_game(GameResult.AGENT2_WIN)
-                    print("Game String:", judge.game_str)
-                    return
-                elif validation:
-                    p1_boost = validation[1]  # Extract boost flag
-                    p1_direction = validation[2]  # Extract direction
-                    break
-            print(f"  Attempt {attempt} failed")
-        
-        # If both attempts failed, use random move or forfeit
-        if not p1_move or not validation:
-            if p1_random > 0:
-                print(f"Using random move for Player 1 ({p1_random} random moves left)")
-                random_agent = RandomPlayer(1)
-                p1_direction = random_agent.get_best_move()
-                p1_random -= 1
-                # Convert Direction to string for handle_move
-                dir_to_str = {Direction.UP: 'UP', Direction.DOWN: 'DOWN', Direction.LEFT: 'LEFT', Direction.RIGHT: 'RIGHT'}
-                validation = judge.handle_move(dir_to_str[p1_direction], 1, is_random=True)
-                p1_boost = False  # Random moves don't use boost
-            else:
-                print("Player 1 has no random moves left. Forfeiting.")
-                judge.end_game(GameResult.AGENT2_WIN)
-                print("Game String:", judge.game_str)
-                return
-        else:
-            # Direction already extracted from validation
-            pass
-        
-        # Player 2 move
-        print("Requesting move from Player 2...")
-        for attempt in range(1, 3):  # 2 attempts
-            p2_move = judge.get_move(2, attempt, p2_random)
-            if p2_move:
-                validation = judge.handle_move(p2_move, 2, is_random=False)
-                if validation == "forfeit":
-                    print("Player 2 forfeited")
-                    judge.end_game(GameResult.AGENT1_WIN)
-                    print("Game String:", judge.game_str)
-                    return
-                elif validation:
-                    p2_boost = validation[1]  # Extract boost flag
-                    p2_direction = validation[2]  # Extract direction
-                    break
-            print(f"  Attempt {attempt} failed")
+        if VERBOSE:
+            print(f"\n=== Turn {judge.game.turns + 1} ===")
         
-        # If both attempts failed, use random move or forfeit
-        if not p2_move or not validation:
-            if p2_random > 0:
-                print(f"Using random move for Player 2 ({p2_random} random moves left)")
-                random_agent = RandomPlayer(2)
-                p2_direction = random_agent.get_best_move()
-                p2_random -= 1
-                # Convert Direction to string for handle_move
-                dir_to_str = {Direction.UP: 'UP', Direction.DOWN: 'DOWN', Direction.LEFT: 'LEFT', Direction.RIGHT: 'RIGHT'}
-                validation = judge.handle_move(dir_to_str[p2_direction], 2, is_random=True)
-                p2_boost = False  # Random moves don't use boost
-            else:
-                print("Player 2 has no random moves left. Forfeiting.")
-                judge.end_game(GameResult.AGENT1_WIN)
-                print("Game String:", judge.game_str)
-                return
-        else:
-            # Direction already extracted from validation
-            pass
+        # Both players think at the same time; their moves are resolved in order below
+        p1_fetch = judge.pool.submit(judge.fetch_move, 1, p1_random)
+        p2_fetch = judge.pool.submit(judge.fetch_move, 2, p2_random)
+
+        p1 = acquire_move(judge, 1, p1_fetch, p1_random)
+        if p1 is None:
+            judge.end_game(GameResult.AGENT2_WIN)
+            print("Game String:", judge.game_str)
+            return
+        p1_direction, p1_boost, p1_random = p1
+
+        p2 = acquire_move(judge, 2, p2_fetch, p2_random)
+        if p2 is None:
+            judge.end_game(GameResult.AGENT1_WIN)
+            print("Game String:", judge.game_str)
+            return
+        p2_direction, p2_boost, p2_random = p2
         
         # Execute both moves simultaneously
         result = judge.game.step(p1_direction, p2_direction, p1_boost, p2_boost)
         
         # Send updated state to both players
-        judge.send_state(1)
-        judge.send_state(2)
+        judge.send_state_both()
         
         # Display current board state
-        print(judge.game.board)
-        print(f"Agent 1: Trail Length={judge.game.agent1.length}, Alive={judge.game.agent1.alive}, Boosts={judge.game.agent1.boosts_remaining}")
-        print(f"Agent 2: Trail Length={judge.game.agent2.length}, Alive={judge.game.agent2.alive}, Boosts={judge.game.agent2.boosts_remaining}")
+        if VERBOSE:
+            a1, a2 = judge.game.agent1, judge.game.agent2
+            sys.stdout.write(
+                f"{judge.game.board}\n"
+                f"Agent 1: Trail Length={a1.length}, Alive={a1.alive}, Boosts={a1.boosts_remaining}\n"
+                f"Agent 2: Trail Length={a2.length}, Alive={a2.alive}, Boosts={a2.boosts_remaining}\n"
+            )
         
         # Check for game end
         if result is not None:
@@ -4,11 +4,18 @@ This agent runs as a Flask server and responds to judge requests.
 """
 
 import os
-from flask import Flask, request, jsonify
+import threading
+import traceback
+from flask import Flask, Response, request
 from collections import deque
+
+import orjson
+from waitress import serve
+
 from agentw import AgentW
 from agents import AgentS
 from agentc import AgentC
+from _accelerated import warmup
 
 app = Flask(__name__)
 
@@ -33,24 +40,105 @@ game_state = {
     "player_number": 1,
 }
 
+# A background worker starts on a move as soon as a state arrives, so
+# /send-move only has to pick the result up. States handed to it are never
+# mutated afterwards (updates rebind keys, deltas copy what they touch).
+MOVE_WAIT = 0.09  # seconds /send-move waits for the worker, inside the judge's 0.1s
+_worker_cv = threading.Condition()
+_pending_state = None         # newest state the worker hasn't started on
+_ready_move = (None, None)    # (turn_count, move) of the last finished state
+_worker = None                # started by the first state post
+
+
+def _read_json():
+    """Parse the request body with orjson; None if it is missing or invalid."""
+    try:
+        return orjson.loads(request.get_data())
+    except orjson.JSONDecodeError:
+        return None
+
+
+def _json_response(payload):
+    """orjson-backed replacement for flask.jsonify."""
+    return Response(orjson.dumps(payload), mimetype="application/json")
+
 
 @app.route("/", methods=["GET"])
 def info():
     """Basic health/info endpoint used by the judge to check connectivity."""
-    return jsonify({"participant": PARTICIPANT, "agent_name": AGENT_NAME}), 200
+    # state_deltas: the judge may post only the trail cells added since the last state
+    return _json_response({"participant": PARTICIPANT, "agent_name": AGENT_NAME, "state_deltas": True}), 200
+
+
+def _apply_delta(data):
+    """Turn a delta post into full trails and board in data, copying rather than mutating game_state's."""
+    board = list(game_state["board"])
+    copied_rows = set()
+    for key in ("agent1_trail", "agent2_trail"):
+        new_cells = data.pop(f"{key}_new", [])
+        data[key] = game_state[key] + new_cells
+        for x, y in new_cells:
+            if y not in copied_rows:
+                board[y] = list(board[y])
+                copied_rows.add(y)
+            board[y][x] = 1
+    data["board"] = board
+
+
+def _submit_state(state):
+    """Hand a state to the move worker, replacing any it hasn't started on."""
+    global _pending_state, _ready_move, _worker
+    with _worker_cv:
+        if _worker is None:
+            _worker = threading.Thread(target=_move_worker, name="move-worker", daemon=True)
+            _worker.start()
+        _pending_state = state
+        _ready_move = (None, None)
+        _worker_cv.notify_all()
+
+
+def _move_worker():
+    global _pending_state, _ready_move
+    move = "RIGHT"
+    while True:
+        with _worker_cv:
+            _worker_cv.wait_for(lambda: _pending_state is not None)
+            state, _pending_state = _pending_state, None
+        try:
+            move = agent.choose_action(state)
+        except Exception as e:
+            # Keep the worker alive; answer this turn with the previous move
+            print(f"Error in choose_action: {e}")
+            traceback.print_exc()
+        print(move)
+        with _worker_cv:
+            # A newer state may have arrived meanwhile; its move supersedes this one
+            if _pending_state is None:
+                _ready_move = (state["turn_count"], move)
+                _worker_cv.notify_all()
 
 
 @app.route("/send-state", methods=["POST"])
 def receive_state():
     """Judge calls this to push the current game state to the agent server."""
-    data = request.get_json()
+    data = _read_json()
     if not data:
-        return jsonify({"error": "no json body"}), 400
+        return _json_response({"error": "no json body"}), 400
     
-    # Update our local game state
-    game_state.update(data)
+    # Posts run on several server threads; apply each one atomically
+    with _worker_cv:
+        if data.pop("delta", False):
+            if game_state["board"] is None or data.get("turn_count", 0) <= game_state["turn_count"]:
+                # Nothing to apply it to, or a stale delta that already lost
+                # out to a newer post; the judge answers with a full state
+                return _json_response({"error": "no base state"}), 409
+            _apply_delta(data)
+
+        # Update our local game state
+        game_state.update(data)
+        _submit_state(dict(game_state))
     
-    return jsonify({"status": "state received"}), 200
+    return _json_response({"status": "state received"}), 200
 
 
 @app.route("/send-move", methods=["GET"])
@@ -60,27 +148,28 @@ def send_move():
     Return format: {"move": "DIRECTION"} or {"move": "DIRECTION:BOOST"}
     """
     # player_number = request.args.get("player_number", default=1, type=int)
-    
-    move = agent.choose_action(game_state)
-
-    
-    # Simple decision logic
-    print(move)
-    return jsonify({"move": move}), 200
+    turn = game_state["turn_count"]
+    with _worker_cv:
+        if _worker_cv.wait_for(lambda: _ready_move[0] == turn, timeout=MOVE_WAIT):
+            return _json_response({"move": _ready_move[1]}), 200
+    # Still thinking; the judge's retry can pick the move up
+    return _json_response({"error": "move not ready"}), 503
 
 
 @app.route("/end", methods=["POST"])
 def end_game():
     """Judge notifies agent that the match finished and provides final state."""
-    data = request.get_json()
+    data = _read_json()
     if data:
         result = data.get("result", "UNKNOWN")
         print(f"\nGame Over! Result: {result}")
-    return jsonify({"status": "acknowledged"}), 200
+    return _json_response({"status": "acknowledged"}), 200
 
 
 if __name__ == "__main__":
-    # For development only. Port can be overridden with the PORT env var.
+    # Port can be overridden with the PORT env var.
     port = int(os.environ.get("PORT", "5009"))
+    warmup()
     print(f"Starting {AGENT_NAME} ({PARTICIPANT}) on port {port}...")
-    app.run(host="0.0.0.0", port=port, debug=False)
+    # Threads keep a slow /send-move from blocking the next /send-state.
+    serve(app, host="0.0.0.0", port=port, threads=4)